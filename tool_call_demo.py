@@ -6,14 +6,74 @@ with improved maintainability through configuration management and modular desig
 
 import os
 import re
+import sys
+import logging
 import json
-from dataclasses import dataclass, field
-from typing import List, Dict, Optional, Any
+import importlib.util
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from dataclasses import dataclass, field, fields
+from typing import List, Dict, Optional, Any, Callable, Tuple, Set
 from datetime import datetime
-from openai import OpenAI
+from openai import OpenAI, DefaultHttpxClient, Timeout, DEFAULT_CONNECTION_LIMITS
+from openai import BadRequestError, UnprocessableEntityError
 import jinja2
 from dotenv import load_dotenv  # For environment variable support
 
+try:
+    import orjson  # Optional: faster JSON decoding
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+try:
+    import ijson  # Optional: incremental parsing of large config files
+except ImportError:
+    ijson = None
+
+
+# Precompiled patterns for parsing LLM output
+_FUNCTION_RE = re.compile(
+    r"<function=(?P<name>[^>]+)>(?P<params>.*?)</function>",
+    re.DOTALL | re.IGNORECASE
+)
+_PARAM_RE = re.compile(
+    r"<parameter=(?P<name>[^>]+)>(?P<value>.*?)</parameter>",
+    re.DOTALL | re.IGNORECASE
+)
+_BLANKLINE_RE = re.compile(r'\n\s*\n')
+
+# Characters a JSON value can start with (used to skip decoding plain strings)
+_JSON_START_CHARS = '{["tfn-0123456789'
+
+# Runs of 19+ digits may not fit in 64 bits (parsed with stdlib json to stay exact)
+_LONG_DIGITS_RE = re.compile(r'\d{19,}')
+
+# HTTP/2 requires the optional "h2" package (pip install "httpx[http2]")
+_HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+# Connection limits class of the HTTP library used by the installed openai SDK
+_HttpLimits = type(DEFAULT_CONNECTION_LIMITS)
+
+
+@lru_cache(maxsize=None)
+def _get_jinja_env(template_dir: str) -> jinja2.Environment:
+    """Return a shared Jinja environment for a template directory."""
+    # On-disk cache for compiled template bytecode (shared across runs). Jinja's
+    # default directory is private to the current user and checked for ownership.
+    try:
+        bytecode_cache = jinja2.FileSystemBytecodeCache(pattern="__jinja2_%s.cache")
+    except (OSError, RuntimeError) as e:
+        print(f"Warning: Template bytecode cache disabled: {str(e)}")
+        bytecode_cache = None
+    
+    return jinja2.Environment(
+        loader=jinja2.FileSystemLoader(template_dir),
+        bytecode_cache=bytecode_cache,
+        auto_reload=False,
+        cache_size=50
+    )
+
 
 # ------------------------------
 # 1. Configuration System
@@ -27,6 +87,7 @@ class ToolCallConfig:
     api_key: str = "your-api-key-here"
     base_url: str = "http://localhost:8080/v1"
     model_name: str = "Seed-OSS"
+    stream_responses: bool = True  # Stream completions and stop early once a tool call is complete
     
     # Template Configuration
     template_path: str = "seed_oss_chat_template.jinja"
@@ -40,6 +101,81 @@ class ToolCallConfig:
     
     # Tool Configuration
     tools: List[Dict[str, Any]] = field(default_factory=list)
+    speculative_tool_prefetch: bool = True  # Pre-run side-effect-free, zero-arg tools into the initial prompt
+    tool_parallelism: int = 8  # Maximum number of tool calls executed concurrently
+
+
+# Environment variable -> (config field, value parser)
+_ENV_MAP: Dict[str, Tuple[str, Callable[[str], Any]]] = {
+    "LLM_API_KEY": ("api_key", str),
+    "LLM_BASE_URL": ("base_url", str),
+    "LLM_MODEL_NAME": ("model_name", str),
+    "TEMPLATE_PATH": ("template_path", str),
+    "MAX_TOKENS": ("max_tokens", int),
+    "SHOW_THINKING_TOKENS": ("show_thinking_tokens", lambda value: value.lower() in ("true", "1", "yes")),
+}
+
+
+# Config files larger than this are parsed incrementally when ijson is installed
+_STREAM_CONFIG_MIN_SIZE = 1 << 20
+
+
+def _stream_config_fields(f, known_fields: Set[str]) -> Dict[str, Any]:
+    """
+    Incrementally parse the top-level fields of a JSON object with ijson.
+    
+    Only values of known fields are built; the subtrees of other keys are skipped
+    event by event, and parsing stops once all known fields have been seen.
+    """
+    events = ijson.parse(f, use_float=True)
+    _, event, _ = next(events, ("", None, None))
+    if event != "start_map":
+        raise ValueError("config file must contain a JSON object")
+    
+    file_config = {}
+    for _, event, key in events:
+        if event == "end_map":
+            break  # End of the top-level object
+        
+        # Consume the value of this key, building it only if it is a known field
+        builder = ijson.ObjectBuilder() if key in known_fields else None
+        depth = 0
+        for _, event, value in events:
+            if builder is not None:
+                builder.event(event, value)
+            if event in ("start_map", "start_array"):
+                depth += 1
+            elif event in ("end_map", "end_array"):
+                depth -= 1
+            if depth == 0:
+                break
+        
+        if builder is not None:
+            file_config[key] = builder.value
+            if len(file_config) == len(known_fields):
+                break
+    
+    return file_config
+
+
+def _read_config_file(config_path: str) -> Dict[str, Any]:
+    """
+    Read the top-level fields of a JSON config file.
+    
+    Large files are streamed with ijson, building only the config fields that
+    load_config keeps; small files are parsed in one go.
+    """
+    if ijson is not None and os.path.getsize(config_path) > _STREAM_CONFIG_MIN_SIZE:
+        # "tools" is always replaced by load_config, so don't build it
+        known_fields = {f.name for f in fields(ToolCallConfig)} - {"tools"}
+        try:
+            with open(config_path, "rb") as f:
+                return _stream_config_fields(f, known_fields)
+        except ijson.JSONError:
+            pass  # Fall back to a regular parse
+    
+    with open(config_path, "rb") as f:
+        return _json_loads(f.read())
 
 
 def load_config(config_path: Optional[str] = None) -> ToolCallConfig:
@@ -53,25 +189,17 @@ def load_config(config_path: Optional[str] = None) -> ToolCallConfig:
     # Start with default configuration
     config = ToolCallConfig()
     
-# Override with environment variables if available
-    if os.getenv("LLM_API_KEY"):
-        config.api_key = os.getenv("LLM_API_KEY")
-    if os.getenv("LLM_BASE_URL"):
-        config.base_url = os.getenv("LLM_BASE_URL")
-    if os.getenv("LLM_MODEL_NAME"):
-        config.model_name = os.getenv("LLM_MODEL_NAME")
-    if os.getenv("TEMPLATE_PATH"):
-        config.template_path = os.getenv("TEMPLATE_PATH")
-    if os.getenv("MAX_TOKENS"):
-        config.max_tokens = int(os.getenv("MAX_TOKENS"))
-    if os.getenv("SHOW_THINKING_TOKENS"):
-        config.show_thinking_tokens = os.getenv("SHOW_THINKING_TOKENS").lower() in ["true", "1", "yes"]
+    # Override with environment variables if available
+    env = os.environ
+    for env_name, (field_name, cast) in _ENV_MAP.items():
+        value = env.get(env_name)
+        if value:
+            setattr(config, field_name, cast(value))
     
     # Override with config file if provided
     if config_path and os.path.exists(config_path):
         try:
-            with open(config_path, "r", encoding="utf-8") as f:
-                file_config = json.load(f)
+            file_config = _read_config_file(config_path)
             
             # Update configuration from file (only known fields)
             for field_name, field_value in file_config.items():
@@ -110,37 +238,129 @@ class LLMToolClient:
     # Thinking tokens from the Jinja template
     THINK_BEGIN_TOKEN = '<seed:think>'
     THINK_END_TOKEN = '</seed:think>'
+    FUNCTION_BEGIN_TOKEN = '<function='
+    FUNCTION_END_TOKEN = '</function>'
+    TOOLCALL_WRAPPER_TOKENS = ('<seed:tool_call>', '</seed:tool_call>')
+    
+    # Placeholder message used to locate the conversation within a rendered prompt
+    FRAME_SENTINEL_MESSAGE = {"role": "user", "content": "<<render_prompt:frame_sentinel>>"}
     
     def __init__(self, config: ToolCallConfig):
         self.config = config
+        # Load the template first so a missing template doesn't leak the connection pool
+        self.template = self._load_jinja_template()
+        
+        # Pooled HTTP client (with the SDK's defaults) keeps connections warm between
+        # successive LLM calls; reads are unbounded so long generations aren't cut off
+        self._http = DefaultHttpxClient(
+            http2=_HTTP2_AVAILABLE,
+            limits=_HttpLimits(max_connections=64, max_keepalive_connections=32),
+            timeout=Timeout(60.0, connect=5.0, read=None),
+        )
         self.client = OpenAI(
             api_key=config.api_key,
             base_url=config.base_url,
+            http_client=self._http,
         )
-        self.template = self._load_jinja_template()
+        
+        # Tool definitions serialized once for templates rendering them as JSON
+        self._tools_json = json.dumps(config.tools, ensure_ascii=False)
+        
+        # Template variables that stay fixed for the lifetime of the client
+        self._template_constants = {
+            "tools": config.tools,
+            "tools_json": self._tools_json,
+            "use_json_tooldef": config.use_json_tooldef,
+            "thinking_budget": config.thinking_budget,
+            "add_generation_prompt": config.add_generation_prompt,
+            "show_thinking_tokens": config.show_thinking_tokens
+        }
+        
+        # Rendered prompt fragments, reused across renders of a growing conversation
+        self._frame_cache: Dict[Optional[str], Optional[Tuple[str, str, Callable[..., str]]]] = {}
+        self._msg_cache: Dict[int, Tuple[Dict[str, Any], str]] = {}
 
     def _load_jinja_template(self) -> jinja2.Template:
-        """Load and compile the Jinja template from file."""
+        """Load the Jinja template, reusing compiled bytecode when cached."""
+        template_dir = os.path.dirname(os.path.abspath(self.config.template_path))
         try:
-            with open(self.config.template_path, "r", encoding="utf-8") as f:
-                source = f.read()
-            return jinja2.Template(source)
-        except FileNotFoundError:
+            env = _get_jinja_env(template_dir)
+            return env.get_template(os.path.basename(self.config.template_path))
+        except jinja2.TemplateNotFound:
             raise RuntimeError(f"Template file not found: {self.config.template_path}")
         except Exception as e:
             raise RuntimeError(f"Failed to load template: {str(e)}")
 
+    def close(self) -> None:
+        """Close the underlying HTTP connection pool."""
+        self._http.close()
+
+    def _template_vars(self, messages: List[Dict[str, str]]) -> Dict[str, Any]:
+        """Build the variables passed to the Jinja template."""
+        return dict(self._template_constants, messages=messages)
+
+    def _get_frame(self, system_message: Optional[str]) -> Optional[Tuple[str, str, Callable[..., str]]]:
+        """
+        Get the (header, footer, render_message) parts of the prompt for a system message.
+        
+        Returns None if the template does not expose a render_message macro, in which
+        case prompts are rendered in full.
+        """
+        if system_message in self._frame_cache:
+            return self._frame_cache[system_message]
+        
+        frame_messages = [] if system_message is None else [{"role": "system", "content": system_message}]
+        frame_messages.append(self.FRAME_SENTINEL_MESSAGE)
+        module = self.template.make_module(self._template_vars(frame_messages))
+        render_message = getattr(module, "render_message", None)
+        
+        frame = None
+        if render_message is not None:
+            # Split the rendered prompt around the placeholder message
+            full = str(module)
+            sentinel = str(render_message(self.FRAME_SENTINEL_MESSAGE))
+            idx = full.find(sentinel)
+            if idx >= 0:
+                frame = (full[:idx], full[idx + len(sentinel):], render_message)
+        
+        self._frame_cache[system_message] = frame
+        return frame
+
     def render_prompt(self, messages: List[Dict[str, str]]) -> str:
-        """Render a prompt using the Jinja template."""
+        """
+        Render a prompt using the Jinja template.
+        
+        Each message is rendered once through the template's render_message macro and
+        cached by identity, so re-rendering a conversation only renders new messages.
+        Only the messages of the most recent call are kept in the cache. Messages must
+        not be mutated after they have been rendered; append new messages instead.
+        """
         try:
-            return self.template.render(
-                messages=messages,
-                tools=self.config.tools,
-                use_json_tooldef=self.config.use_json_tooldef,
-                thinking_budget=self.config.thinking_budget,
-                add_generation_prompt=self.config.add_generation_prompt,
-                show_thinking_tokens=self.config.show_thinking_tokens
-            )
+            system_message = None
+            loop_messages = messages
+            if messages and messages[0]["role"] == "system":
+                system_message = messages[0]["content"]
+                loop_messages = messages[1:]
+            
+            frame = self._get_frame(system_message)
+            if frame is None:
+                return self.template.render(**self._template_vars(messages))
+            
+            header, footer, render_message = frame
+            parts = [header]
+            msg_cache = {}
+            for message in loop_messages:
+                # Keep a reference to the message so its id() can't be reused
+                cached = self._msg_cache.get(id(message))
+                if cached is None or cached[0] is not message:
+                    cached = (message, str(render_message(message)))
+                msg_cache[id(message)] = cached
+                parts.append(cached[1])
+            parts.append(footer)
+            
+            # Drop fragments of messages that are no longer part of the conversation
+            self._msg_cache = msg_cache
+            return "".join(parts)
         except Exception as e:
             raise RuntimeError(f"Failed to render prompt: {str(e)}")
 
@@ -160,35 +380,188 @@ class LLMToolClient:
             return llm_output
             
         # When thinking tokens are disabled, remove all <seed:think> ... </seed:think> blocks
-        try:
-            # Pattern to match <seed:think> ... </seed:think> blocks (non-greedy)
-            pattern = re.compile(f"{re.escape(self.THINK_BEGIN_TOKEN)}(.*?){re.escape(self.THINK_END_TOKEN)}", 
-                              re.DOTALL)
-            
-            # Remove all thinking blocks while preserving the rest of the text
-            processed_output = pattern.sub("", llm_output)
+        # using plain substring search (faster than a regex for fixed delimiters)
+        begin, end = self.THINK_BEGIN_TOKEN, self.THINK_END_TOKEN
+        parts = []
+        removed = False
+        i = 0
+        while True:
+            j = llm_output.find(begin, i)
+            if j < 0:
+                parts.append(llm_output[i:])
+                break
+            parts.append(llm_output[i:j])
+            k = llm_output.find(end, j + len(begin))
+            if k < 0:
+                # Keep an unterminated thinking block as-is
+                parts.append(llm_output[j:])
+                break
+            i = k + len(end)
+            removed = True
+        
+        if not removed:
+            return llm_output.strip()
+        
+        # Clean up any extra whitespace left by removed blocks
+        return _BLANKLINE_RE.sub('\n\n', "".join(parts)).strip()
+
+    def _complete(self, prompt: str) -> str:
+        """Request a full (non-streamed) completion and return the raw text."""
+        response = self.client.completions.create(
+            model=self.config.model_name,
+            prompt=prompt,
+            max_tokens=self.config.max_tokens,
+        )
+        return response.choices[0].text if response.choices else ""
+
+    def _extend_tool_calls(self, output: str, end: int) -> Tuple[int, bool]:
+        """
+        Extend the tool-call section of a streamed output past position end.
+        
+        Skips whitespace and <seed:tool_call> wrapper tokens and consumes any further
+        complete <function=...> ... </function> blocks.
+        
+        Returns:
+            (end of the last complete function block, whether non-tool-call text follows)
+        """
+        # Tags are matched case-insensitively, like _FUNCTION_RE in parse_tool_calls
+        pos = end
+        while True:
+            while pos < len(output) and output[pos].isspace():
+                pos += 1
+            if pos == len(output):
+                return end, False
             
-            # Clean up any extra whitespace from removed blocks
-            processed_output = re.sub(r'\n\s*\n', '\n\n', processed_output).strip()
+            wrapper = next((token for token in self.TOOLCALL_WRAPPER_TOKENS
+                            if output[pos:pos + len(token)].lower() == token), None)
+            if wrapper is not None:
+                pos += len(wrapper)
+                continue
             
-            return processed_output
+            if output[pos:pos + len(self.FUNCTION_BEGIN_TOKEN)].lower() == self.FUNCTION_BEGIN_TOKEN:
+                match = _FUNCTION_RE.match(output, pos)
+                if match is None:
+                    return end, False  # Function block is still being generated
+                pos = end = match.end()
+                continue
             
-        except Exception as e:
-            # Fall back to original output if processing fails
-            print(f"Warning: Failed to process thinking tokens: {str(e)}")
-            return llm_output
+            # A partial token may still turn into tool-call markup
+            tail = output[pos:].lower()
+            tokens = self.TOOLCALL_WRAPPER_TOKENS + (self.FUNCTION_BEGIN_TOKEN,)
+            return end, not any(token.startswith(tail) for token in tokens)
 
-    def call_llm(self, prompt: str) -> str:
-        """Send a prompt to the LLM and get the processed response."""
+    def _complete_streaming(self, prompt: str) -> Optional[str]:
+        """
+        Stream a completion and return the raw text.
+        
+        Once the tool calls are complete, i.e. the first non-tool-call text follows a
+        <function=...> ... </function> block outside a thinking block, the stream is
+        closed and the output is truncated after the last block, so tool execution does
+        not wait for the model to finish generating.
+        
+        Returns None if the server rejected or ignored the streaming request.
+        """
         try:
-            response = self.client.completions.create(
+            stream = self.client.completions.create(
                 model=self.config.model_name,
                 prompt=prompt,
                 max_tokens=self.config.max_tokens,
+                stream=True,
             )
+        except (BadRequestError, UnprocessableEntityError) as e:
+            # Rejected before any output was generated, e.g. stream=True is unsupported
+            print(f"Warning: Streaming request rejected, retrying without streaming: {str(e)}")
+            return None
+        
+        # Some servers ignore stream=True and send a regular JSON completion, which
+        # the SDK would read as an empty event stream
+        content_type = stream.response.headers.get("content-type", "")
+        if not content_type.startswith("text/event-stream"):
+            stream.close()
+            print(f"Warning: Server did not stream the response ({content_type}), retrying without streaming")
+            return None
+        
+        output = ""
+        tool_calls_end = 0  # End of the last complete function block, once one was seen
+        try:
+            for chunk in stream:
+                text = chunk.choices[0].text if chunk.choices else ""
+                if not text:
+                    continue
+                
+                if tool_calls_end:
+                    output += text
+                    tool_calls_end, finished = self._extend_tool_calls(output, tool_calls_end)
+                    if finished:
+                        return output[:tool_calls_end]
+                    continue
+                
+                # Only re-scan when the new text may have completed a closing tag
+                scan_from = max(0, len(output) - len(self.FUNCTION_END_TOKEN) + 1)
+                output += text
+                if self.FUNCTION_END_TOKEN not in output[scan_from:].lower():
+                    continue
+                
+                # Ignore tool-call markup while the model is still thinking
+                think_end = output.rfind(self.THINK_END_TOKEN)
+                if output.rfind(self.THINK_BEGIN_TOKEN) > think_end:
+                    continue
+                
+                search_start = think_end + len(self.THINK_END_TOKEN) if think_end >= 0 else 0
+                match = _FUNCTION_RE.search(output, search_start)
+                if match:
+                    tool_calls_end, finished = self._extend_tool_calls(output, match.end())
+                    if finished:
+                        return output[:tool_calls_end]
+        finally:
+            stream.close()
+        
+        return output[:tool_calls_end] if tool_calls_end else output
+
+    def call_llm(self, prompt: str) -> str:
+        """Send a prompt to the LLM and get the processed response."""
+        try:
+            raw_output = None
+            if self.config.stream_responses:
+                raw_output = self._complete_streaming(prompt)
+            if raw_output is None:
+                raw_output = self._complete(prompt)
             
-            raw_output = response.choices[0].text.strip() if response.choices else ""
-            return self._process_llm_response(raw_output)
+            return self._process_llm_response(raw_output.strip())
+            
+        except Exception as e:
+            raise RuntimeError(f"LLM API call failed: {str(e)}")
+
+    def call_llm_batch(self, prompts: List[str], batch_size: int = 8) -> List[str]:
+        """
+        Send several prompts to the LLM and get the processed responses in order.
+        
+        The completions API accepts a list of prompts and returns one choice per
+        prompt, so N prompts cost ceil(N / batch_size) requests instead of N.
+        Pick batch_size so a single batched request still finishes well within the
+        server's timeout and rate-limit window: larger batches save request overhead,
+        but every prompt in a batch waits for the slowest one.
+        """
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1")
+        
+        outputs = []
+        try:
+            for start in range(0, len(prompts), batch_size):
+                batch = prompts[start:start + batch_size]
+                response = self.client.completions.create(
+                    model=self.config.model_name,
+                    prompt=batch,
+                    max_tokens=self.config.max_tokens,
+                )
+                
+                # Choices may arrive in any order; each carries its prompt's index
+                raw_outputs = [""] * len(batch)
+                for choice in response.choices:
+                    raw_outputs[choice.index] = choice.text
+                outputs.extend(self._process_llm_response(text.strip()) for text in raw_outputs)
+            
+            return outputs
             
         except Exception as e:
             raise RuntimeError(f"LLM API call failed: {str(e)}")
@@ -200,24 +573,89 @@ class LLMToolClient:
 class ToolExecutor:
     """Executes tool functions and manages results."""
     
+    # Tools that are safe to run speculatively (no side effects, no arguments)
+    PREFETCHABLE_TOOLS = {"get_current_local_time"}
+    
+    # (epoch second, formatted time) of the last get_current_local_time call
+    _local_time_cache = (0, "")
+    
     @staticmethod
     def get_current_local_time() -> str:
         """Get current local date/time in human-readable format."""
         now = datetime.now()
-        return now.strftime("%Y-%m-%d %H:%M:%S %Z%z")  # e.g., "2024-05-20 16:30:00 EDT-0400"
+        sec = int(now.timestamp())
+        
+        # The output has one-second resolution, so reuse it within the same second
+        cached_sec, cached_str = ToolExecutor._local_time_cache
+        if sec != cached_sec:
+            cached_str = now.strftime("%Y-%m-%d %H:%M:%S %Z%z")  # e.g., "2024-05-20 16:30:00 EDT-0400"
+            ToolExecutor._local_time_cache = (sec, cached_str)
+        return cached_str
 
 
-    @staticmethod
-    def execute_tool_call(tool_call: Dict[str, Any]) -> str:
+    # Tool name -> implementation lookup used by execute_tool_call
+    _DISPATCH: Dict[str, Callable[..., str]] = {
+        "get_current_local_time": get_current_local_time.__func__,
+    }
+
+
+    @classmethod
+    def register(cls, name: str, fn: Callable[..., str], prefetchable: bool = False) -> None:
+        """
+        Register a tool implementation so it can be dispatched by name.
+        
+        Set prefetchable=True for side-effect-free tools that may be run ahead of
+        the first LLM call (only zero-argument tools are actually prefetched).
+        """
+        cls._DISPATCH[name] = fn
+        if prefetchable:
+            cls.PREFETCHABLE_TOOLS.add(name)
+        else:
+            cls.PREFETCHABLE_TOOLS.discard(name)
+
+
+    @classmethod
+    def execute_tool_call(cls, tool_call: Dict[str, Any]) -> str:
         """Execute a single tool call and return the result."""
         func_name = tool_call["function"]["name"]
         func_args = tool_call["function"]["arguments"]
         
         # Execute the requested tool
-        if func_name == "get_current_local_time":
-            return ToolExecutor.get_current_local_time()
-        else:
+        func = cls._DISPATCH.get(func_name)
+        if func is None:
             raise ValueError(f"Unknown function '{func_name}'")
+        return func(**func_args)
+
+
+    @staticmethod
+    def prefetch_tool_results(tools: List[Dict[str, Any]]) -> List[Dict[str, str]]:
+        """
+        Run prefetchable tools up front so their results can be inlined into the
+        initial prompt, letting the LLM answer without a second round-trip.
+        """
+        results = []
+        for tool in tools:
+            function = tool.get("function", {})
+            func_name = function.get("name")
+            if func_name not in ToolExecutor.PREFETCHABLE_TOOLS:
+                continue
+            if function.get("parameters", {}).get("properties"):
+                continue  # Only zero-argument tools can be resolved ahead of time
+            
+            # Prefetching is best-effort: on failure the model can still request the tool
+            try:
+                result = ToolExecutor.execute_tool_call({"function": {"name": func_name, "arguments": {}}})
+            except Exception as e:
+                Logger.log_step(f"⚠️ PREFETCH SKIPPED: {func_name}", f"{type(e).__name__}: {str(e)}")
+                continue
+            
+            results.append({
+                "role": "tool",
+                "content": result,
+                "tool_call_id": f"precomputed_{len(results)}"
+            })
+        
+        return results
 
 
     @staticmethod
@@ -225,32 +663,30 @@ class ToolExecutor:
         """Extract tool calls from LLM output using the template's <function=...> delimiters."""
         tool_calls = []
         
-        # Regex to match function blocks (supports multi-line parameters)
-        function_pattern = re.compile(
-            r"<function=(?P<name>[^>]+)>(?P<params>.*?)</function>",
-            re.DOTALL | re.IGNORECASE
-        )
-        
-        for match in function_pattern.finditer(llm_output):
+        # Match function blocks (supports multi-line parameters)
+        for match in _FUNCTION_RE.finditer(llm_output):
             func_name = match.group("name").strip()
             params_text = match.group("params").strip()
             
             # Parse parameters (if any) using <parameter=...> tags
             params = {}
             if params_text:
-                param_pattern = re.compile(
-                    r"<parameter=(?P<name>[^>]+)>(?P<value>.*?)</parameter>",
-                    re.DOTALL | re.IGNORECASE
-                )
-                for param_match in param_pattern.finditer(params_text):
+                for param_match in _PARAM_RE.finditer(params_text):
                     param_name = param_match.group("name").strip()
                     param_value = param_match.group("value").strip()
                     
-                    # Convert string values to basic types (int/float/bool)
-                    try:
-                        param_value = json.loads(param_value)
-                    except:
-                        pass  # Keep as string if JSON parsing fails
+                    # Convert string values to basic types (int/float/bool); only attempt
+                    # decoding when the first character could start a JSON value
+                    first = param_value[:1]
+                    if first and first in _JSON_START_CHARS:
+                        try:
+                            # orjson decodes integers beyond 64 bits as lossy floats
+                            if _LONG_DIGITS_RE.search(param_value):
+                                param_value = json.loads(param_value)
+                            else:
+                                param_value = _json_loads(param_value)
+                        except (ValueError, TypeError):
+                            pass  # Keep as string if JSON parsing fails
                     
                     params[param_name] = param_value
             
@@ -268,27 +704,71 @@ class ToolExecutor:
 # 4. Utilities
 # ------------------------------
 
+# Step logs are emitted at DEBUG level; set LOG_LEVEL = logging.INFO (or higher) to silence them
+LOG_LEVEL = logging.DEBUG
+
+
 class Logger:
     """Simple logging utility with consistent formatting."""
     
+    TOP_BORDER = f"┌{'─' * 60}┐\n"
+    BOTTOM_BORDER = f"└{'─' * 60}┘\n"
+    
     @staticmethod
     def log_step(step: str, details: str = "", max_length: int = 5000) -> None:
         """Log workflow steps with clear formatting and truncation for long outputs."""
-        print(f"┌{'─' * 60}┐")
-        print(f"│ {step}")
+        if LOG_LEVEL > logging.DEBUG:
+            return
+        
+        # Assemble the whole block and emit it with a single write
+        parts = [Logger.TOP_BORDER, "│ ", step, "\n"]
         if details:
-            truncated_details = details[:max_length] + "..." if len(details) > max_length else details
-            print(f"│   Details: {truncated_details}")
-        print(f"└{'─' * 60}┘")
+            parts.append("│   Details: ")
+            parts.append(details[:max_length])
+            parts.append("...\n" if len(details) > max_length else "\n")
+        parts.append(Logger.BOTTOM_BORDER)
+        sys.stdout.write("".join(parts))
 
 
 # ------------------------------
 # 5. Main Workflow
 # ------------------------------
 
+def execute_tool_calls(tool_executor: ToolExecutor, tool_calls: List[Dict[str, Any]],
+                       max_parallelism: int = 8) -> List[Dict[str, str]]:
+    """Execute tool calls concurrently and return tool messages in the original order."""
+    tool_results = []
+
+    # Run tool calls concurrently; results are collected in the original order
+    max_workers = max(1, min(max_parallelism, len(tool_calls)))
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        futures = [pool.submit(tool_executor.execute_tool_call, tc) for tc in tool_calls]
+
+    for idx, (tc, future) in enumerate(zip(tool_calls, futures)):
+        try:
+            result = future.result()
+            tool_results.append({
+                "role": "tool",
+                "content": result,
+                "tool_call_id": f"call_{idx}"  # Simplified ID for tracking
+            })
+            Logger.log_step(f"✅ TOOL RESULT: {tc['function']['name']}", result)
+        except Exception as e:
+            error_msg = f"❌ ERROR in tool '{tc['function']['name']}': {str(e)}"
+            tool_results.append({
+                "role": "tool",
+                "content": error_msg,
+                "tool_call_id": f"call_{idx}"
+            })
+            Logger.log_step(f"❌ TOOL ERROR: {tc['function']['name']}", str(e))
+
+    return tool_results
+
+
 def run_tool_calling_demo(config_path: Optional[str] = None):
     """Run the complete tool calling demo workflow."""
     Logger.log_step("🚀 STARTING LLM TOOL CALLING DEMO (PROFESSIONAL VERSION)")
+    llm_client = None
     
     try:
         # Load configuration
@@ -305,6 +785,14 @@ def run_tool_calling_demo(config_path: Optional[str] = None):
         conversation.append({"role": "user", "content": user_query})
         Logger.log_step("💬 USER INPUT", user_query)
 
+        # Step 0: Inline results of side-effect-free tools to save an LLM round-trip
+        if config.speculative_tool_prefetch:
+            prefetched_results = tool_executor.prefetch_tool_results(config.tools)
+            if prefetched_results:
+                conversation.extend(prefetched_results)
+                Logger.log_step("⚡ PREFETCHED TOOL RESULTS",
+                                ", ".join(result["content"] for result in prefetched_results))
+
         # Step 1: Render initial prompt
         Logger.log_step("🎨 RENDERING INITIAL PROMPT")
         rendered_prompt = llm_client.render_prompt(conversation)
@@ -325,25 +813,7 @@ def run_tool_calling_demo(config_path: Optional[str] = None):
 
         # Step 4: Execute tool calls
         Logger.log_step("🔧 EXECUTING TOOL CALLS", f"Found {len(tool_calls)} tool(s)")
-        tool_results = []
-
-        for idx, tc in enumerate(tool_calls):
-            try:
-                result = tool_executor.execute_tool_call(tc)
-                tool_results.append({
-                    "role": "tool",
-                    "content": result,
-                    "tool_call_id": f"call_{idx}"  # Simplified ID for tracking
-                })
-                Logger.log_step(f"✅ TOOL RESULT: {tc['function']['name']}", result)
-            except Exception as e:
-                error_msg = f"❌ ERROR in tool '{tc['function']['name']}': {str(e)}"
-                tool_results.append({
-                    "role": "tool",
-                    "content": error_msg,
-                    "tool_call_id": f"call_{idx}"
-                })
-                Logger.log_step(f"❌ TOOL ERROR: {tc['function']['name']}", str(e))
+        tool_results = execute_tool_calls(tool_executor, tool_calls, config.tool_parallelism)
 
         # Step 5: Add results to conversation & re-render prompt
         for result in tool_results:
@@ -364,6 +834,76 @@ def run_tool_calling_demo(config_path: Optional[str] = None):
         Logger.log_step("❌ CRITICAL ERROR OCCURRED", f"{type(e).__name__}: {str(e)}")
         import traceback
         Logger.log_step("📋 FULL TRACEBACK", traceback.format_exc())
+    finally:
+        if llm_client is not None:
+            llm_client.close()
+
+
+def run_tool_calling_demo_batch(queries: List[str], config_path: Optional[str] = None,
+                                batch_size: int = 8) -> Optional[List[str]]:
+    """
+    Run the tool calling workflow for several queries, batching LLM requests.
+    
+    Initial prompts are sent together via call_llm_batch; queries that request
+    tools are then answered with a second batched call. Returns the final answers
+    in query order, or None if the workflow failed.
+    """
+    Logger.log_step("🚀 STARTING BATCHED LLM TOOL CALLING DEMO", f"{len(queries)} queries, batch size {batch_size}")
+    llm_client = None
+    
+    try:
+        # Load configuration
+        config = load_config(config_path)
+        Logger.log_step("⚙️ LOADED CONFIGURATION", f"Using template: {config.template_path}")
+        
+        # Initialize clients
+        llm_client = LLMToolClient(config)
+        tool_executor = ToolExecutor()
+        
+        # Initialize conversations (prefetched tool results are shared by all queries)
+        prefetched_results = []
+        if config.speculative_tool_prefetch:
+            prefetched_results = tool_executor.prefetch_tool_results(config.tools)
+        conversations = [[{"role": "user", "content": query}, *prefetched_results] for query in queries]
+
+        # Step 1: Send all initial prompts in batches
+        Logger.log_step("📤 SENDING INITIAL PROMPTS TO LLM")
+        answers = llm_client.call_llm_batch(
+            [llm_client.render_prompt(conversation) for conversation in conversations], batch_size)
+
+        # Step 2: Execute tool calls for every query that requested them
+        pending = []
+        for idx, (conversation, llm_output) in enumerate(zip(conversations, answers)):
+            tool_calls = tool_executor.parse_tool_calls(llm_output)
+            if not tool_calls:
+                continue
+            
+            Logger.log_step(f"🔧 EXECUTING TOOL CALLS (QUERY {idx + 1})", f"Found {len(tool_calls)} tool(s)")
+            for result in execute_tool_calls(tool_executor, tool_calls, config.tool_parallelism):
+                conversation.append({"role": "tool", "content": result["content"]})
+            pending.append(idx)
+
+        # Step 3: Get final responses for queries that used tools
+        if pending:
+            Logger.log_step("📤 SENDING FINAL PROMPTS FOR ANSWERS", f"{len(pending)} queries")
+            final_answers = llm_client.call_llm_batch(
+                [llm_client.render_prompt(conversations[idx]) for idx in pending], batch_size)
+            for idx, final_answer in zip(pending, final_answers):
+                answers[idx] = final_answer
+
+        for query, answer in zip(queries, answers):
+            Logger.log_step(f"🎉 FINAL LLM RESPONSE: {query}", answer if answer else "No answer generated")
+        
+        return answers
+
+    except Exception as e:
+        Logger.log_step("❌ CRITICAL ERROR OCCURRED", f"{type(e).__name__}: {str(e)}")
+        import traceback
+        Logger.log_step("📋 FULL TRACEBACK", traceback.format_exc())
+        return None
+    finally:
+        if llm_client is not None:
+            llm_client.close()
 
 
 # ------------------------------